@@ -5,12 +5,90 @@
 提供简单易用的Python客户端，用于调用音色设计API服务。
 """
 
+import asyncio
+import json
+import os
+import queue
+import re
+import httpx
 import requests
+import threading
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set
 import logging
 
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 流式写入时等待写盘的最大数据块数量
+WRITE_QUEUE_DEPTH = 8
+
+# list_audio_files识别的音频文件扩展名
+AUDIO_EXTENSIONS = frozenset({".wav", ".mp3", ".flac", ".ogg", ".m4a"})
+
+# 文件名中不允许出现的字符（仅保留字母数字、空格、下划线和连字符）
+# 对20字符的文本，re.sub比带缓存映射表的str.translate更快
+_UNSAFE_CHARS_RE = re.compile(r"[^\w \-]")
+
+# 服务器繁忙时需要退避重试的HTTP状态码
+RETRY_STATUSES = (429, 502, 503, 504)
+RETRY_BACKOFF_FACTOR = 0.5
+
+
+_logging_lock = threading.Lock()
+_logging_initialized = False
+
+
+def _configure_logging() -> None:
+    """为客户端日志添加输出处理器（整个进程只执行一次）"""
+    global _logging_initialized
+    if _logging_initialized:
+        return
+    with _logging_lock:
+        if _logging_initialized:
+            return
+        logger = logging.getLogger(__name__)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        _logging_initialized = True
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[str]) -> float:
+    """计算第 attempt 次重试前的等待时间，优先使用服务器给出的Retry-After"""
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return RETRY_BACKOFF_FACTOR * (2**attempt)
+
+
+class _RateLimiter:
+    """限制请求发起频率：相邻两次发起之间至少间隔 interval 秒"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_time = 0.0
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        now = time.monotonic()
+        start = max(now, self._next_time)
+        self._next_time = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
 
 class VoiceDesignClient:
     """音色设计API客户端"""
@@ -21,6 +99,10 @@ class VoiceDesignClient:
         port: int = 8867,
         timeout: int = 60,
         verify_ssl: bool = True,
+        download_chunk_size: int = 128 * 1024,
+        pool_maxsize: int = 4,
+        batch_concurrency: int = 4,
+        max_retries: int = 5,
     ):
         """
         初始化客户端
@@ -30,21 +112,151 @@ class VoiceDesignClient:
             port: 服务器端口
             timeout: 请求超时时间（秒）
             verify_ssl: 是否验证SSL证书
+            download_chunk_size: 下载音频时每次读取的块大小（字节）
+            pool_maxsize: 连接池中保持的最大连接数
+            batch_concurrency: 批量生成时的最大并发请求数
+            max_retries: 服务器繁忙（429/502/503/504）时的最大重试次数
         """
         self.base_url = f"http://{host}:{port}"
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        self.download_chunk_size = download_chunk_size
+        self.batch_concurrency = batch_concurrency
+        self.max_retries = max_retries
+        # 已确认存在的输出目录，避免重复mkdir
+        self._parent_ready: Set[Path] = set()
+
+        # 复用TCP连接（keep-alive），避免每次请求重新握手
+        # 仅在服务器返回繁忙状态码（RETRY_STATUSES）时按指数退避重试；
+        # 连接失败立即报错，读取超时不重试，避免重复提交耗时的生成请求
+        retry = Retry(
+            total=max_retries,
+            connect=0,
+            read=False,
+            other=0,
+            backoff_factor=RETRY_BACKOFF_FACTOR,
+            status_forcelist=list(RETRY_STATUSES),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=max(pool_maxsize, batch_concurrency),
+            max_retries=retry,
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        _configure_logging()
         self.logger = logging.getLogger(__name__)
 
-        # 设置日志
-        if not self.logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-            )
-            handler.setFormatter(formatter)
-            self.logger.addHandler(handler)
-            self.logger.setLevel(logging.INFO)
+    def close(self) -> None:
+        """关闭客户端，释放连接池"""
+        self._session.close()
+
+    def __enter__(self) -> "VoiceDesignClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """创建批量生成使用的异步HTTP客户端"""
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            verify=self.verify_ssl,
+            limits=httpx.Limits(max_connections=self.batch_concurrency),
+        )
+
+    def _prepare_output(
+        self,
+        text: str,
+        instruct: str,
+        output_file: Optional[str],
+        auto_timestamp: bool,
+    ) -> Path:
+        """校验参数并确定输出文件路径"""
+        # 参数验证
+        if not text.strip():
+            raise ValueError("文本内容不能为空")
+
+        if not instruct.strip():
+            raise ValueError("语音指令不能为空")
+
+        # 生成输出文件名
+        if output_file is None:
+            output_file = self._auto_filename(text, auto_timestamp)
+
+        # 确保输出目录存在
+        output_path = Path(output_file)
+        self._ensure_dir(output_path.parent)
+        return output_path
+
+    def _auto_filename(self, text: str, auto_timestamp: bool, suffix: str = "") -> str:
+        """根据文本自动生成输出文件名，suffix用于区分同一批次中的任务"""
+        timestamp = int(time.time()) if auto_timestamp else ""
+        safe_text = _UNSAFE_CHARS_RE.sub("", text[:20]).strip()
+        if safe_text:
+            return f"voice_{timestamp}_{safe_text}{suffix}.wav"
+        return f"voice_{timestamp}{suffix}.wav"
+
+    def _ensure_dir(self, directory: Path) -> None:
+        """创建目录（每个目录只创建一次）"""
+        if directory not in self._parent_ready:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._parent_ready.add(directory)
+
+    def _log_saved(self, file_size: int, start_time: float) -> None:
+        """输出音频保存结果"""
+        elapsed_time = time.time() - start_time
+
+        self.logger.info("✅ 音频生成成功")
+        self.logger.info(".1f")
+        self.logger.info(f"   文件大小: {file_size} bytes")
+        self.logger.info(f"   生成用时: {elapsed_time:.1f}秒")
+
+        if file_size < 1000:
+            self.logger.warning("⚠️ 生成的文件可能不完整，请检查内容")
+
+    def _save_response(self, response: requests.Response, output_file: str) -> int:
+        """将响应体写入文件，返回写入的字节数"""
+        # 流式写入：当前线程只负责接收，由后台线程写盘，
+        # 有界队列保证内存占用不超过 WRITE_QUEUE_DEPTH 个数据块
+        chunks: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=WRITE_QUEUE_DEPTH)
+        write_errors: List[Exception] = []
+
+        def writer(f) -> None:
+            # 出错后继续取出队列中的数据块，保证接收线程不会阻塞在put上
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    return
+                if not write_errors:
+                    try:
+                        f.write(chunk)
+                    except Exception as e:
+                        write_errors.append(e)
+
+        bytes_written = 0
+        with open(output_file, "wb", buffering=1024 * 1024) as f:
+            thread = threading.Thread(target=writer, args=(f,), daemon=True)
+            thread.start()
+            try:
+                for chunk in response.iter_content(
+                    chunk_size=self.download_chunk_size
+                ):
+                    if write_errors:
+                        break
+                    chunks.put(chunk)
+                    bytes_written += len(chunk)
+            finally:
+                chunks.put(None)
+                thread.join()
+
+        if write_errors:
+            raise write_errors[0]
+        return bytes_written
 
     def check_server_status(self) -> Dict[str, Any]:
         """
@@ -59,12 +271,12 @@ class VoiceDesignClient:
         """
         try:
             self.logger.info("检查服务器状态...")
-            response = requests.get(
+            response = self._session.get(
                 f"{self.base_url}/", timeout=10, verify=self.verify_ssl
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = _json_loads(response.content)
             self.logger.info("✅ 服务器运行正常")
             return data
 
@@ -101,27 +313,8 @@ class VoiceDesignClient:
             ValueError: 参数错误或服务器响应错误
             IOError: 文件保存错误
         """
-        # 参数验证
-        if not text.strip():
-            raise ValueError("文本内容不能为空")
-
-        if not instruct.strip():
-            raise ValueError("语音指令不能为空")
-
-        # 生成输出文件名
-        if output_file is None:
-            timestamp = int(time.time()) if auto_timestamp else ""
-            safe_text = "".join(
-                c for c in text[:20] if c.isalnum() or c in " _-"
-            ).strip()
-            if safe_text:
-                output_file = f"voice_{timestamp}_{safe_text}.wav"
-            else:
-                output_file = f"voice_{timestamp}.wav"
-
-        # 确保输出目录存在
-        output_path = Path(output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path = self._prepare_output(text, instruct, output_file, auto_timestamp)
+        output_file = str(output_path)
 
         # 准备请求参数
         params = {"text": text, "language": language, "instruct": instruct}
@@ -134,7 +327,7 @@ class VoiceDesignClient:
 
         try:
             # 发送请求
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/generate_audio",
                 params=params,
                 timeout=self.timeout,
@@ -144,24 +337,12 @@ class VoiceDesignClient:
             response.raise_for_status()
 
             # 保存音频文件
-            with open(output_file, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            file_size = self._save_response(response, output_file)
 
             # 验证文件
-            file_size = output_path.stat().st_size
-            elapsed_time = time.time() - start_time
-
-            self.logger.info("✅ 音频生成成功")
-            self.logger.info(".1f")
-            self.logger.info(f"   文件大小: {file_size} bytes")
-            self.logger.info(f"   生成用时: {elapsed_time:.1f}秒")
+            self._log_saved(file_size, start_time)
 
-            if file_size < 1000:
-                self.logger.warning("⚠️ 生成的文件可能不完整，请检查内容")
-
-            return str(output_file)
+            return output_file
 
         except requests.Timeout:
             self.logger.error(f"请求超时 ({self.timeout}s)")
@@ -181,70 +362,203 @@ class VoiceDesignClient:
             self.logger.error(f"文件保存错误: {e}")
             raise
 
+    async def agenerate_audio(
+        self,
+        text: str,
+        language: str = "Chinese",
+        instruct: str = "温柔的女声",
+        output_file: Optional[str] = None,
+        auto_timestamp: bool = True,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> str:
+        """
+        异步生成音频
+
+        Args:
+            text: 要合成的文本
+            language: 文本语言 (Chinese, English等)
+            instruct: 语音指令，描述音色特点
+            output_file: 输出文件名，如果为None则自动生成
+            auto_timestamp: 是否在文件名中添加时间戳
+            client: 复用的异步HTTP客户端，为None时临时创建
+
+        Returns:
+            保存的音频文件路径
+
+        Raises:
+            httpx.HTTPError: 网络请求错误
+            ValueError: 参数错误或服务器响应错误
+            IOError: 文件保存错误
+        """
+        if client is None:
+            async with self._async_client() as client:
+                return await self.agenerate_audio(
+                    text, language, instruct, output_file, auto_timestamp, client
+                )
+
+        output_path = self._prepare_output(text, instruct, output_file, auto_timestamp)
+        output_file = str(output_path)
+
+        # 准备请求参数
+        params = {"text": text, "language": language, "instruct": instruct}
+
+        self.logger.info(f"开始生成音频: {text[:50]}...")
+        self.logger.info(f"语言: {language}, 指令: {instruct}")
+        self.logger.info(f"输出文件: {output_file}")
+
+        start_time = time.time()
+
+        try:
+            for attempt in range(self.max_retries + 1):
+                async with client.stream(
+                    "POST", f"{self.base_url}/generate_audio", params=params
+                ) as response:
+                    if (
+                        response.status_code in RETRY_STATUSES
+                        and attempt < self.max_retries
+                    ):
+                        wait = _backoff_delay(
+                            attempt, response.headers.get("Retry-After")
+                        )
+                    else:
+                        if response.is_error:
+                            await response.aread()
+                            response.raise_for_status()
+
+                        # 保存音频文件（文件操作放到线程中执行，不阻塞事件循环）
+                        file_size = 0
+                        f = await asyncio.to_thread(open, output_file, "wb")
+                        try:
+                            async for chunk in response.aiter_bytes(
+                                self.download_chunk_size
+                            ):
+                                await asyncio.to_thread(f.write, chunk)
+                                file_size += len(chunk)
+                        finally:
+                            await asyncio.to_thread(f.close)
+                        break
+
+                self.logger.warning(
+                    f"服务器繁忙 (HTTP {response.status_code})，{wait:.1f}秒后重试"
+                )
+                await asyncio.sleep(wait)
+
+            # 验证文件
+            self._log_saved(file_size, start_time)
+
+            return output_file
+
+        except httpx.TimeoutException:
+            self.logger.error(f"请求超时 ({self.timeout}s)")
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 500:
+                error_msg = e.response.text
+                self.logger.error(f"服务器错误: {error_msg}")
+                raise ValueError(f"音频生成失败: {error_msg}") from e
+            else:
+                self.logger.error(f"HTTP错误: {e}")
+                raise
+        except httpx.HTTPError as e:
+            self.logger.error(f"网络请求错误: {e}")
+            raise
+        except IOError as e:
+            self.logger.error(f"文件保存错误: {e}")
+            raise
+
     def batch_generate(
         self,
         texts_and_settings: list,
         output_dir: str = "batch_output",
-        delay: float = 1.0,
+        delay: float = 0.0,
     ) -> Dict[str, str]:
         """
         批量生成音频
 
+        任务通过异步HTTP客户端并发提交，并发数由 batch_concurrency 控制。
+        在已运行的事件循环中请直接使用 abatch_generate。
+
         Args:
             texts_and_settings: 文本和设置的列表
                 格式: [{"text": "文本", "language": "Chinese", "instruct": "指令"}, ...]
             output_dir: 输出目录
-            delay: 每次请求间的延迟（秒）
+            delay: 相邻两次请求发起之间的最小间隔（秒），默认不限制
 
         Returns:
             文件名到文件路径的映射字典
         """
+        return asyncio.run(
+            self.abatch_generate(texts_and_settings, output_dir=output_dir, delay=delay)
+        )
+
+    async def abatch_generate(
+        self,
+        texts_and_settings: list,
+        output_dir: str = "batch_output",
+        delay: float = 0.0,
+    ) -> Dict[str, str]:
+        """
+        异步批量生成音频，参数与返回值同 batch_generate
+        """
         output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(output_path)
 
-        results = {}
+        total = len(texts_and_settings)
+        limiter = _RateLimiter(delay)
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
 
-        self.logger.info(f"开始批量生成，共 {len(texts_and_settings)} 个任务")
+        self.logger.info(f"开始批量生成，共 {total} 个任务")
         self.logger.info(f"输出目录: {output_dir}")
 
-        for i, item in enumerate(texts_and_settings, 1):
-            self.logger.info(f"处理任务 {i}/{len(texts_and_settings)}")
-
-            # 提取参数
-            text = item.get("text", "")
-            language = item.get("language", "Chinese")
-            instruct = item.get("instruct", "温柔的女声")
-            custom_filename = item.get("filename")
-
-            try:
-                # 生成音频
-                output_file = str(output_path / custom_filename) if custom_filename else None
-                file_path = self.generate_audio(
-                    text=text,
-                    language=language,
-                    instruct=instruct,
-                    output_file=output_file,
-                    auto_timestamp=True,
+        async def run_task(
+            client: httpx.AsyncClient, i: int, item: Dict[str, Any]
+        ) -> str:
+            async with semaphore:
+                await limiter.wait()
+                self.logger.info(f"处理任务 {i}/{total}")
+
+                # 提取参数
+                # 未指定文件名时附加任务序号，避免并发任务的自动文件名相同
+                custom_filename = item.get("filename")
+                if custom_filename:
+                    output_file = str(output_path / custom_filename)
+                else:
+                    output_file = self._auto_filename(
+                        item.get("text", ""), True, suffix=f"_{i}"
+                    )
+
+                try:
+                    file_path = await self.agenerate_audio(
+                        text=item.get("text", ""),
+                        language=item.get("language", "Chinese"),
+                        instruct=item.get("instruct", "温柔的女声"),
+                        output_file=output_file,
+                        auto_timestamp=True,
+                        client=client,
+                    )
+                    self.logger.info(f"✅ 任务 {i} 完成")
+                    return file_path
+                except Exception as e:
+                    self.logger.error(f"❌ 任务 {i} 失败: {e}")
+                    return f"ERROR: {e}"
+
+        async with self._async_client() as client:
+            outcomes = await asyncio.gather(
+                *(
+                    run_task(client, i, item)
+                    for i, item in enumerate(texts_and_settings, 1)
                 )
+            )
 
-                results[text[:30] + "..."] = file_path
-                self.logger.info(f"✅ 任务 {i} 完成")
-
-            except Exception as e:
-                self.logger.error(f"❌ 任务 {i} 失败: {e}")
-                results[text[:30] + "..."] = f"ERROR: {e}"
-
-            # 请求间延迟
-            if i < len(texts_and_settings) and delay > 0:
-                self.logger.info(".1f")
-                time.sleep(delay)
+        # 按提交顺序整理结果
+        results = {}
+        for item, outcome in zip(texts_and_settings, outcomes):
+            results[item.get("text", "")[:30] + "..."] = outcome
 
         success_count = sum(
             1 for v in results.values() if not str(v).startswith("ERROR:")
         )
-        self.logger.info(
-            f"批量生成完成: {success_count}/{len(texts_and_settings)} 成功"
-        )
+        self.logger.info(f"批量生成完成: {success_count}/{total} 成功")
 
         return results
 
@@ -258,14 +572,15 @@ class VoiceDesignClient:
         Returns:
             音频文件列表
         """
-        audio_extensions = {".wav", ".mp3", ".flac", ".ogg", ".m4a"}
-        audio_files = []
-
-        for file_path in Path(directory).glob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in audio_extensions:
-                audio_files.append(str(file_path))
-
-        return sorted(audio_files)
+        # DirEntry自带文件类型信息，无需对每个条目再调用stat
+        base = Path(directory)
+        with os.scandir(directory) as entries:
+            return sorted(
+                str(base / entry.name)
+                for entry in entries
+                if entry.is_file()
+                and os.path.splitext(entry.name)[1].lower() in AUDIO_EXTENSIONS
+            )
 
 
 # 便捷函数
@@ -289,8 +604,8 @@ def quick_generate(
     Returns:
         生成的音频文件路径
     """
-    client = VoiceDesignClient(host=host, port=port)
-    return client.generate_audio(text, instruct=instruct, output_file=output_file)
+    with VoiceDesignClient(host=host, port=port) as client:
+        return client.generate_audio(text, instruct=instruct, output_file=output_file)
 
 
 def main():
@@ -339,6 +654,8 @@ def main():
     except Exception as e:
         print(f"❌ 错误: {e}")
         return 1
+    finally:
+        client.close()
 
     return 0
 
@@ -5,6 +5,7 @@
 简单的功能测试，不启动完整服务器
 """
 
+import shutil
 import requests
 import time
 
@@ -40,16 +41,16 @@ def test_api_quick(base_url="http://localhost:8867"):
         print(f"   发送请求: {test_text[:20]}...")
 
         response = requests.post(
-            f"{base_url}/generate_audio", params=params, timeout=30
+            f"{base_url}/generate_audio", params=params, timeout=30, stream=True
         )
 
         if response.status_code == 200:
-            # 保存文件
+            # 流式保存文件，内存占用与音频长度无关
             filename = f"quick_test_{int(time.time())}.wav"
+            response.raw.decode_content = True
             with open(filename, "wb") as f:
-                f.write(response.content)
-
-            file_size = len(response.content)
+                shutil.copyfileobj(response.raw, f, length=128 * 1024)
+                file_size = f.tell()
             print(".1f")
             print(f"   保存文件: {filename}")
 
@@ -1,12 +1,13 @@
-import io
+import asyncio
 import logging
+import struct
 from contextlib import asynccontextmanager
 
+import numpy as np
 import torch
-import soundfile as sf
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from qwen_tts import Qwen3TTSModel
 
 # 配置日志
@@ -17,11 +18,106 @@ logger = logging.getLogger(__name__)
 model = None
 model_path = "/root/autodl-tmp/Qwen/Qwen3-TTS-12Hz-1.7B-VoiceDesign"
 
+# 动态批处理配置：在 max_wait_ms 时间窗口内最多合并 max_batch_size 个请求
+max_batch_size = 4
+max_wait_ms = 10
+request_queue = None
+batch_worker = None
+
+
+def encode_wav_pcm16(pcm: np.ndarray, sr: int) -> bytes:
+    """将int16采样封装为WAV字节（44字节头 + 原始PCM数据）"""
+    channels = 1 if pcm.ndim == 1 else pcm.shape[1]
+    data = np.ascontiguousarray(pcm, dtype="<i2")
+    data_size = data.nbytes
+    block_align = channels * 2
+    header = struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + data_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,
+        channels,
+        sr,
+        sr * block_align,
+        block_align,
+        16,
+        b"data",
+        data_size,
+    )
+    # join直接读取数组缓冲区，只拷贝一次
+    return b"".join((header, data.data))
+
+
+def generate_voice_design(**kwargs):
+    """在推理模式下调用模型（inference_mode按线程生效，需在工作线程内开启）"""
+    with torch.inference_mode():
+        return model.generate_voice_design(**kwargs)
+
+
+async def run_batch(batch):
+    """在线程池中对一批请求调用模型，并将结果分发给各请求"""
+    try:
+        if len(batch) == 1:
+            text, language, instruct, _ = batch[0]
+            wavs, sr = await run_in_threadpool(
+                generate_voice_design,
+                text=text,
+                language=language,
+                instruct=instruct,
+            )
+        else:
+            wavs, sr = await run_in_threadpool(
+                generate_voice_design,
+                text=[item[0] for item in batch],
+                language=[item[1] for item in batch],
+                instruct=[item[2] for item in batch],
+            )
+    except Exception as e:
+        if len(batch) > 1:
+            # 批次中任一请求出错都会导致整批失败，逐个重试以隔离各请求的结果
+            logger.warning(f"批次推理失败，逐个重试: {e}")
+            for item in batch:
+                if not item[3].done():
+                    await run_batch([item])
+            return
+        future = batch[0][3]
+        if not future.done():
+            future.set_exception(e)
+        return
+
+    for (*_, future), wav in zip(batch, wavs):
+        if not future.done():
+            future.set_result((wav, sr))
+
+
+async def batch_loop():
+    """从请求队列中收集请求，合并为批次后统一推理"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await request_queue.get()]
+        deadline = loop.time() + max_wait_ms / 1000
+        while len(batch) < max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(request_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        if len(batch) > 1:
+            logger.info(f"合并批次推理: {len(batch)} 个请求")
+        await run_batch(batch)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时初始化模型
-    global model
+    global model, request_queue, batch_worker
     try:
         logger.info("正在加载Qwen3-TTS模型...")
         model = Qwen3TTSModel.from_pretrained(
@@ -35,9 +131,18 @@ async def lifespan(app: FastAPI):
         logger.error(f"模型加载失败: {e}")
         raise
 
+    # 启动批处理后台任务
+    request_queue = asyncio.Queue()
+    batch_worker = asyncio.create_task(batch_loop())
+
     yield
 
-    # 关闭时清理资源（如果需要）
+    # 关闭时停止批处理任务
+    batch_worker.cancel()
+    try:
+        await batch_worker
+    except asyncio.CancelledError:
+        pass
     logger.info("应用关闭")
 
 
@@ -84,23 +189,23 @@ async def generate_audio(
 
         logger.info(f"开始生成音频 - 文本: {text[:50]}..., 语言: {language}")
 
-        # 调用模型生成音频
-        wavs, sr = model.generate_voice_design(
-            text=text,
-            language=language,
-            instruct=instruct,
-        )
+        # 提交到批处理队列，模型推理在线程池中执行，不阻塞事件循环
+        future = asyncio.get_running_loop().create_future()
+        await request_queue.put((text, language, instruct, future))
+        wav, sr = await future
+
+        # 转换为16位PCM，相比默认的32位浮点数据体积减半
+        pcm = np.clip(np.asarray(wav, dtype=np.float32), -1.0, 1.0)
+        pcm = (pcm * 32767.0).astype(np.int16)
 
-        # 将音频数据转换为WAV格式的字节流
-        audio_buffer = io.BytesIO()
-        sf.write(audio_buffer, wavs[0], sr, format="WAV")
-        audio_buffer.seek(0)
+        # 直接拼装WAV头和PCM数据，无需经过soundfile编码
+        content = encode_wav_pcm16(pcm, sr)
 
         logger.info("音频生成完成")
 
-        # 返回音频流
-        return StreamingResponse(
-            audio_buffer,
+        # 返回音频数据
+        return Response(
+            content=content,
             media_type="audio/wav",
             headers={"Content-Disposition": "attachment; filename=generated_audio.wav"},
         )